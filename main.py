@@ -1,8 +1,11 @@
 import os
-import io
+import asyncio
+import shutil
+import tempfile
+from typing import BinaryIO
 from fastapi import FastAPI, HTTPException, Form, Depends, UploadFile, File, Query
 from pyrogram import Client, types
-from pyrogram.enums import ChatMembersFilter
+from pyrogram.enums import ChatMembersFilter, ChatType
 from pyrogram.types import ChatPrivileges
 from pyrogram.errors import (
     PeerIdInvalid,
@@ -11,9 +14,13 @@ from pyrogram.errors import (
     InviteRequestSent,
 )
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from redis import asyncio as aioredis
-import json
+import orjson
+import time
+import ahocorasick
 
 import logging
 
@@ -45,114 +52,327 @@ SESSION_FILE = f"{SESSION_NAME}.session"
 TOKEN = os.getenv("SECRET_TOKEN")
 MAIN_REDIS_KEY = f"listener:{PHONE_NUMBER.replace('+', '')}:"
 
-redis_client = aioredis.from_url(os.getenv("REDIS_URL"), decode_responses=True)
+# Replies are left as bytes: writes only return ints, and orjson parses bytes directly
+redis_client = aioredis.from_url(
+    os.getenv("REDIS_URL"),
+    decode_responses=False,
+    socket_keepalive=True,
+    health_check_interval=30,
+    max_connections=32,
+)
 
 
 pyro_client: Client = None
 
+KEYWORDS_KEY = "listener:keywords"
+# 关键词缓存有效期（秒）
+KEYWORDS_CACHE_TTL = 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class Keyword:
+    """An active listener keyword, as stored in the keyword cache."""
+
+    target: str
+    target_lower: str
+    pattern: str
+    word_limit: int
+    has_username: int
+    user_id: int | None
+
+
+_KEYWORDS_CACHE = {"ts": 0.0, "data": [], "exact": None, "fuzzy": None}
+
+# 待推送消息队列
+PUSH_QUEUE_SIZE = 10_000
+PUSH_BATCH_SIZE = 100
+# 每个用户推送消息 Stream 的最大长度（近似裁剪）
+PUSH_STREAM_MAXLEN = 10_000
+# 推送消息保留时间 24小时：更早的消息被裁剪，无新消息的 Stream 整体过期
+PUSH_TTL = 24 * 60 * 60
+PUSH_KEY_PATTERN = "listener:push:messages:*"
+# 旧版本使用列表存储推送消息，迁移时改名到此前缀下
+LEGACY_PUSH_KEY_PREFIX = "listener:push:legacy:"
+
+push_queue: asyncio.Queue = None
+# 放入队列后通知后台任务写完剩余消息并退出
+_PUSH_STOP = object()
+# 关闭时等待后台任务写完剩余消息的时间（秒）
+PUSH_SHUTDOWN_TIMEOUT = 10.0
+_PUSH_STATS = {"dropped": 0}
+
+
+def _build_automaton(needles: dict) -> ahocorasick.Automaton | None:
+    """
+    Builds an Aho-Corasick automaton mapping each needle to the indexes of the
+    keywords using it. Returns None when there is nothing to match.
+    """
+    if not needles:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for needle, indexes in needles.items():
+        automaton.add_word(needle, indexes)
+    automaton.make_automaton()
+    return automaton
+
+
+async def _get_keywords():
+    """
+    Returns the keyword cache, refreshing it from Redis at most once per
+    KEYWORDS_CACHE_TTL seconds. Besides the active keywords, the cache holds
+    one automaton for exact keywords and one for lowercased fuzzy keywords.
+    Fuzzy keywords without any cased characters go into the exact automaton.
+    """
+    now = time.monotonic()
+    if now - _KEYWORDS_CACHE["ts"] <= KEYWORDS_CACHE_TTL:
+        return _KEYWORDS_CACHE
+
+    raw = await redis_client.get(KEYWORDS_KEY)
+
+    data = []
+    exact_needles = {}
+    fuzzy_needles = {}
+    for keyword in orjson.loads(raw) if raw else []:
+        # 只缓存启用的关键词
+        if not keyword.get("is_active", False):
+            continue
+
+        target_keyword = keyword.get("keyword", "")
+        target_lower = target_keyword.lower()
+        match_pattern = keyword.get("match_pattern", "exact")
+
+        index = len(data)
+        data.append(
+            Keyword(
+                target=target_keyword,
+                target_lower=target_lower,
+                pattern=match_pattern,
+                word_limit=keyword.get("word_limit", 0),
+                has_username=keyword.get("has_username", 0),
+                user_id=keyword.get("user_id"),
+            )
+        )
+
+        # 空关键词不参与匹配
+        if not target_keyword:
+            continue
+
+        # 不区分大小写的关键词（如中文、数字）模糊匹配与精确匹配等价，
+        # 放入精确匹配自动机，避免对消息做 lower()
+        needs_ci = target_lower != target_keyword.upper()
+
+        if match_pattern == "exact" or (match_pattern == "fuzzy" and not needs_ci):
+            exact_needles.setdefault(target_keyword, []).append(index)
+        elif match_pattern == "fuzzy":
+            fuzzy_needles.setdefault(target_lower, []).append(index)
+
+    _KEYWORDS_CACHE["ts"] = now
+    _KEYWORDS_CACHE["data"] = data
+    _KEYWORDS_CACHE["exact"] = _build_automaton(exact_needles)
+    _KEYWORDS_CACHE["fuzzy"] = _build_automaton(fuzzy_needles)
+    return _KEYWORDS_CACHE
+
+
+def _enqueue_push(push_key: str, push_data: dict):
+    """
+    Queues a message for the push worker without waiting on Redis. When the
+    queue is full the oldest message is dropped.
+    """
+    if push_queue.full():
+        push_queue.get_nowait()
+        _PUSH_STATS["dropped"] += 1
+        logging.warning(
+            "Push queue is full, dropped the oldest message (%d dropped so far)",
+            _PUSH_STATS["dropped"],
+        )
+    push_queue.put_nowait((push_key, push_data))
+
+
+async def _flush_pushes(batch: list):
+    """
+    Appends a batch of queued messages to their push streams in a single
+    pipeline. Each entry stores the JSON payload under the "data" field. Entries
+    older than PUSH_TTL are trimmed and the stream expires after PUSH_TTL
+    without new messages.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    push_keys = set()
+    for push_key, push_data in batch:
+        pipe.xadd(
+            push_key,
+            {"data": orjson.dumps(push_data)},
+            maxlen=PUSH_STREAM_MAXLEN,
+            approximate=True,
+        )
+        push_keys.add(push_key)
+
+    min_id = f"{int((time.time() - PUSH_TTL) * 1000)}-0"
+    for push_key in push_keys:
+        pipe.xtrim(push_key, minid=min_id, approximate=False)
+        pipe.expire(push_key, PUSH_TTL)
+    await pipe.execute()
+
+    logging.info("Pushed %d message(s) to %d user(s)", len(batch), len(push_keys))
+
+
+async def _migrate_push_lists():
+    """
+    Renames push keys still holding lists from older versions, which would make
+    XADD fail with WRONGTYPE. The lists keep their TTL, so consumers can drain
+    them from LEGACY_PUSH_KEY_PREFIX until they expire.
+    """
+    prefix = PUSH_KEY_PATTERN.rstrip("*")
+    async for key in redis_client.scan_iter(match=PUSH_KEY_PATTERN, _type="list"):
+        legacy_key = LEGACY_PUSH_KEY_PREFIX + key.decode()[len(prefix) :]
+        if await redis_client.renamenx(key, legacy_key):
+            logging.info("Moved legacy push list %s to %s", key.decode(), legacy_key)
+        else:
+            logging.warning(
+                "Could not move legacy push list %s, %s already exists",
+                key.decode(),
+                legacy_key,
+            )
 
-async def handle_message(client: Client, message: types.Message):
-    try:
-        if not message.from_user:
-            return
 
-        if message.from_user.is_self:
+async def _safe_flush_pushes(batch: list):
+    """
+    Flushes a batch, logging instead of raising when Redis fails.
+    """
+    if not batch:
+        return
+
+    try:
+        await _flush_pushes(batch)
+    except Exception as e:
+        logging.error("Error pushing %d message(s): %s", len(batch), e)
+
+
+async def _push_worker():
+    """
+    Drains the push queue, batching whatever has accumulated (up to
+    PUSH_BATCH_SIZE messages) into one Redis round trip. Returns after flushing
+    everything queued before _PUSH_STOP.
+    """
+    while True:
+        batch = []
+        item = await push_queue.get()
+        while item is not _PUSH_STOP:
+            batch.append(item)
+            if len(batch) >= PUSH_BATCH_SIZE or push_queue.empty():
+                break
+            item = push_queue.get_nowait()
+
+        await _safe_flush_pushes(batch)
+
+        if item is _PUSH_STOP:
             return
 
-        text = message.text or message.caption
 
-        if not text:
+async def handle_message(client: Client, message: types.Message):
+    try:
+        # 先做不需要访问Redis的过滤：私聊、自己、机器人、无文本的消息直接忽略
+        chat = message.chat
+        if chat.type == ChatType.PRIVATE:
             return
 
-        if message.chat.type.value == "private":
+        from_user = message.from_user
+        if not from_user:
             return
 
-        if message.from_user.is_bot:
+        if from_user.is_self or from_user.is_bot:
             return
 
-        full_name = message.from_user.full_name
-        username = message.from_user.username
-        user_id = message.from_user.id
+        message_text = message.text or message.caption
 
-        logging.info(
-            f"Received message from {username} [{user_id}] ({full_name}): {text:.50}"
-        )
+        if not message_text:
+            return
 
-        key = "listener:keywords"
-        keywords = await redis_client.get(key)
+        # full_name 需要拼接字符串，仅在会输出日志时获取
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(
+                "Received message from %s [%s] (%s): %.50s",
+                from_user.username,
+                from_user.id,
+                from_user.full_name,
+                message_text,
+            )
+
+        cache = await _get_keywords()
+        keywords = cache["data"]
 
         if not keywords:
             return
 
-        keywords = json.loads(keywords)
+        # 一次遍历匹配所有关键词
+        matched = set()
+        if cache["exact"] is not None:
+            for _, indexes in cache["exact"].iter(message_text):
+                matched.update(indexes)
+        # 只有存在区分大小写的模糊关键词时才需要小写副本
+        if cache["fuzzy"] is not None:
+            for _, indexes in cache["fuzzy"].iter(message_text.lower()):
+                matched.update(indexes)
 
-        is_push = False
+        # 消息字数在首次需要时计算一次
+        word_count = None
 
-        for keyword in keywords:
-            is_active = keyword.get("is_active", False)
-            if not is_active:
-                continue
+        # 按关键词原始顺序处理命中结果
+        for index in sorted(matched):
+            keyword = keywords[index]
 
             # 获取关键词匹配参数
-            match_pattern = keyword.get("match_pattern", "exact")
-            word_limit = keyword.get("word_limit", 0)
-            has_username = keyword.get("has_username", 0)
-            target_keyword = keyword.get("keyword", "")
-            user_id = keyword.get("user_id")
-
-            # 根据匹配模式进行匹配
-            message_text = message.text or message.caption or ""
-            if match_pattern == "exact" and target_keyword in message_text:
-                is_push = True
-            elif (
-                match_pattern == "fuzzy"
-                and target_keyword.lower() in message_text.lower()
-            ):
-                is_push = True
+            word_limit = keyword.word_limit
+            has_username = keyword.has_username
+            target_keyword = keyword.target
+            user_id = keyword.user_id
 
             # 如果需要检查用户名且消息没有用户名，则跳过
-            if has_username and not message.from_user.username:
+            if has_username and not from_user.username:
                 continue
 
             # 如果有字数限制且不满足，则跳过
-            if word_limit > 0 and len(message_text.split()) < word_limit:
-                continue
+            if word_limit > 0:
+                if word_count is None:
+                    word_count = len(message_text.split())
+                if word_count < word_limit:
+                    continue
 
             # 如果匹配成功，保存到Redis
-            if is_push:
-                push_data = {
-                    "message_id": message.id,
-                    "message_link": message.link,
-                    "chat_title": message.chat.title,
-                    "chat_username": message.chat.username,
-                    "chat_type": message.chat.type.value,
-                    "chat_id": message.chat.id,
-                    "user_name": message.from_user.username,
-                    "user_full_name": message.from_user.full_name,
-                    "user_id": message.from_user.id,
-                    "text": message_text,
-                    "date": message.date.timestamp(),
-                    "matched_keyword": target_keyword,
-                }
-
-                # 使用Redis列表存储待推送消息
-                push_key = f"listener:push:messages:{user_id}"
-                await redis_client.rpush(push_key, json.dumps(push_data))
+            push_data = {
+                "message_id": message.id,
+                "message_link": message.link,
+                "chat_title": chat.title,
+                "chat_username": chat.username,
+                "chat_type": chat.type.value,
+                "chat_id": chat.id,
+                "user_name": from_user.username,
+                "user_full_name": from_user.full_name,
+                "user_id": from_user.id,
+                "text": message_text,
+                "date": message.date.timestamp(),
+                "matched_keyword": target_keyword,
+            }
 
-                # 设置过期时间 24小时
-                await redis_client.expire(push_key, 24 * 60 * 60)
+            # 使用Redis Stream存储待推送消息，由后台任务批量写入
+            push_key = f"listener:push:messages:{user_id}"
+            _enqueue_push(push_key, push_data)
 
-                logging.info(f"Pushed message to user {user_id}")
+            logging.info("Queued message for user %s", user_id)
 
-                break  # 匹配成功一次后就退出循环
+            break  # 匹配成功一次后就退出循环
 
     except Exception as e:
-        logging.error(f"Error handling message: {str(e)}")
+        logging.error("Error handling message: %s", e)
 
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
-    global pyro_client
+    global pyro_client, push_queue
+    await _migrate_push_lists()
+    push_queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+    push_worker = asyncio.create_task(_push_worker())
+
     pyro_client = Client(
         SESSION_NAME,
         api_id=API_ID,
@@ -165,8 +385,95 @@ async def lifespan(application: FastAPI):
     yield
     await pyro_client.stop()
 
+    # 通知后台任务写完队列中剩余的消息后退出，超时则取消
+    await push_queue.put(_PUSH_STOP)
+    try:
+        await asyncio.wait_for(push_worker, PUSH_SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.warning(
+            "Push worker did not finish in %.0fs and was cancelled, "
+            "its in-flight batch may be lost",
+            PUSH_SHUTDOWN_TIMEOUT,
+        )
 
-app = FastAPI(title="FastAPI Telegram Group Manager Backend", lifespan=lifespan)
+    # 写入后台任务未处理的消息
+    batch = []
+    while not push_queue.empty():
+        item = push_queue.get_nowait()
+        if item is not _PUSH_STOP:
+            batch.append(item)
+    await _safe_flush_pushes(batch)
+
+
+app = FastAPI(
+    title="FastAPI Telegram Group Manager Backend",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# ChatPrivileges fields accepted by /promote_chat_member
+_PRIV_FIELDS = frozenset(
+    {
+        "can_manage_chat",
+        "can_delete_messages",
+        "can_delete_stories",
+        "can_manage_video_chats",
+        "can_restrict_members",
+        "can_promote_members",
+        "can_change_info",
+        "can_post_messages",
+        "can_post_stories",
+        "can_edit_messages",
+        "can_edit_stories",
+        "can_invite_users",
+        "can_pin_messages",
+        "can_manage_topics",
+        "is_anonymous",
+    }
+)
+
+# Response key -> ChatPermissions attribute returned by /get_chat_members
+_MEMBER_PERM_FIELDS = {
+    field: field
+    for field in (
+        "can_send_messages",
+        "can_send_media_messages",
+        "can_send_polls",
+        "can_add_web_page_previews",
+        "can_change_info",
+        "can_invite_users",
+        "can_pin_messages",
+        "can_manage_topics",
+        "can_send_audios",
+        "can_send_docs",
+        "can_send_games",
+        "can_send_gifs",
+        "can_send_inline",
+        "can_send_photos",
+        "can_send_plain",
+        "can_send_roundvideos",
+        "can_send_stickers",
+        "can_send_videos",
+    )
+} | {"can_send_voice": "can_send_voices"}
+
+# ChatPrivileges attributes returned by /get_chat_members
+_MEMBER_PRIV_FIELDS = (
+    "can_manage_chat",
+    "can_delete_messages",
+    "can_delete_stories",
+    "can_manage_video_chats",
+    "can_restrict_members",
+    "can_promote_members",
+    "can_change_info",
+    "can_post_messages",
+    "can_edit_messages",
+    "can_edit_stories",
+    "can_invite_users",
+    "can_pin_messages",
+    "can_manage_topics",
+    "is_anonymous",
+)
 
 
 ### Endpoints ###
@@ -258,23 +565,7 @@ async def promote_chat_member(
     credentials: HTTPAuthorizationCredentials = Depends(authenticate),
 ):
     try:
-        privileges = ChatPrivileges(
-            can_manage_chat=request.can_manage_chat,
-            can_delete_messages=request.can_delete_messages,
-            can_delete_stories=request.can_delete_stories,
-            can_manage_video_chats=request.can_manage_video_chats,
-            can_restrict_members=request.can_restrict_members,
-            can_promote_members=request.can_promote_members,
-            can_change_info=request.can_change_info,
-            can_post_messages=request.can_post_messages,
-            can_post_stories=request.can_post_stories,
-            can_edit_messages=request.can_edit_messages,
-            can_edit_stories=request.can_edit_stories,
-            can_invite_users=request.can_invite_users,
-            can_pin_messages=request.can_pin_messages,
-            can_manage_topics=request.can_manage_topics,
-            is_anonymous=request.is_anonymous,
-        )
+        privileges = ChatPrivileges(**request.model_dump(include=_PRIV_FIELDS))
 
         success = await pyro_client.promote_chat_member(
             request.chat_id, request.user_id, privileges=privileges
@@ -291,14 +582,53 @@ async def promote_chat_member(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _member_to_dict(member: types.ChatMember) -> dict:
+    """
+    Converts a ChatMember into the dict returned by /get_chat_members.
+    """
+    user = member.user
+    perms = member.permissions
+    privs = member.privileges
+
+    return {
+        "user_id": user.id,
+        "user_name": user.username,
+        "status": member.status,
+        "is_bot": user.is_bot,
+        "chat": member.chat.title if member.chat else None,
+        "joined_date": member.joined_date.isoformat() if member.joined_date else None,
+        "custom_title": member.custom_title,
+        "until_date": member.until_date.isoformat() if member.until_date else None,
+        "invited_by": member.invited_by.username if member.invited_by else None,
+        "promoted_by": member.promoted_by.username if member.promoted_by else None,
+        "restricted_by": member.restricted_by.username
+        if member.restricted_by
+        else None,
+        "is_member": member.is_member,
+        "can_be_edited": member.can_be_edited,
+        "subscription_until_date": member.subscription_until_date
+        if member.subscription_until_date
+        else None,
+        "permissions": {
+            key: getattr(perms, field, None)
+            for key, field in _MEMBER_PERM_FIELDS.items()
+        }
+        if perms
+        else None,
+        "privileges": {
+            field: getattr(privs, field, None) for field in _MEMBER_PRIV_FIELDS
+        }
+        if privs
+        else None,
+    }
+
+
 @app.post("/get_chat_members")
 async def get_chat_members(
     request: GetChatMembersRequest,
     credentials: HTTPAuthorizationCredentials = Depends(authenticate),
 ):
     try:
-        members = []
-
         # Map the string filter to the actual ChatMembersFilter enum
         filter_mapping = {
             "search": ChatMembersFilter.SEARCH,
@@ -312,117 +642,13 @@ async def get_chat_members(
         # Default to SEARCH filter if not provided or if it's an empty string
         chat_filter = filter_mapping.get(request.filter, ChatMembersFilter.SEARCH)
 
-        async for member in pyro_client.get_chat_members(
+        members = pyro_client.get_chat_members(
             request.chat_id, limit=request.limit or 1000, filter=chat_filter
-        ):
-            member_dict = {
-                "user_id": member.user.id,
-                "user_name": member.user.username,
-                "status": member.status,
-                "is_bot": member.user.is_bot,
-                "chat": member.chat.title if member.chat else None,
-                "joined_date": member.joined_date.isoformat()
-                if member.joined_date
-                else None,
-                "custom_title": member.custom_title,
-                "until_date": member.until_date.isoformat()
-                if member.until_date
-                else None,
-                "invited_by": member.invited_by.username if member.invited_by else None,
-                "promoted_by": member.promoted_by.username
-                if member.promoted_by
-                else None,
-                "restricted_by": member.restricted_by.username
-                if member.restricted_by
-                else None,
-                "is_member": member.is_member,
-                "can_be_edited": member.can_be_edited,
-                "subscription_until_date": member.subscription_until_date
-                if member.subscription_until_date
-                else None,
-                "permissions": {
-                    "can_send_messages": member.permissions.can_send_messages
-                    if member.permissions
-                    else None,
-                    "can_send_media_messages": member.permissions.can_send_media_messages
-                    if member.permissions
-                    else None,
-                    "can_send_polls": member.permissions.can_send_polls
-                    if member.permissions
-                    else None,
-                    "can_add_web_page_previews": member.permissions.can_add_web_page_previews
-                    if member.permissions
-                    else None,
-                    "can_change_info": member.permissions.can_change_info
-                    if member.permissions
-                    else None,
-                    "can_invite_users": member.permissions.can_invite_users
-                    if member.permissions
-                    else None,
-                    "can_pin_messages": member.permissions.can_pin_messages
-                    if member.permissions
-                    else None,
-                    "can_manage_topics": member.permissions.can_manage_topics
-                    if member.permissions
-                    else None,
-                    "can_send_audios": member.permissions.can_send_audios
-                    if member.permissions
-                    else None,
-                    "can_send_docs": member.permissions.can_send_docs
-                    if member.permissions
-                    else None,
-                    "can_send_games": member.permissions.can_send_games
-                    if member.permissions
-                    else None,
-                    "can_send_gifs": member.permissions.can_send_gifs
-                    if member.permissions
-                    else None,
-                    "can_send_inline": member.permissions.can_send_inline
-                    if member.permissions
-                    else None,
-                    "can_send_photos": member.permissions.can_send_photos
-                    if member.permissions
-                    else None,
-                    "can_send_plain": member.permissions.can_send_plain
-                    if member.permissions
-                    else None,
-                    "can_send_roundvideos": member.permissions.can_send_roundvideos
-                    if member.permissions
-                    else None,
-                    "can_send_stickers": member.permissions.can_send_stickers
-                    if member.permissions
-                    else None,
-                    "can_send_videos": member.permissions.can_send_videos
-                    if member.permissions
-                    else None,
-                    "can_send_voice": member.permissions.can_send_voices
-                    if member.permissions
-                    else None,
-                }
-                if member.permissions
-                else None,
-                "privileges": {
-                    "can_manage_chat": member.privileges.can_manage_chat,
-                    "can_delete_messages": member.privileges.can_delete_messages,
-                    "can_delete_stories": member.privileges.can_delete_stories,
-                    "can_manage_video_chats": member.privileges.can_manage_video_chats,
-                    "can_restrict_members": member.privileges.can_restrict_members,
-                    "can_promote_members": member.privileges.can_promote_members,
-                    "can_change_info": member.privileges.can_change_info,
-                    "can_post_messages": member.privileges.can_post_messages,
-                    "can_edit_messages": member.privileges.can_edit_messages,
-                    "can_edit_stories": member.privileges.can_edit_stories,
-                    "can_invite_users": member.privileges.can_invite_users,
-                    "can_pin_messages": member.privileges.can_pin_messages,
-                    "can_manage_topics": member.privileges.can_manage_topics,
-                    "is_anonymous": member.privileges.is_anonymous,
-                }
-                if member.privileges
-                else None,
-            }
-            members.append(member_dict)
+        )
 
-        return {"members": members}
+        # Fetch the first member before streaming so Telegram errors are still
+        # returned as HTTP errors
+        first_member = await anext(members, None)
     except ChatAdminRequired:
         raise HTTPException(
             status_code=403, detail="You need to be an admin to get the members list."
@@ -436,6 +662,35 @@ async def get_chat_members(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    async def stream_members():
+        if first_member is None:
+            return
+
+        try:
+            yield orjson.dumps(_member_to_dict(first_member)) + b"\n"
+            async for member in members:
+                yield orjson.dumps(_member_to_dict(member)) + b"\n"
+        except Exception as e:
+            # The 200 status is already sent, so end the stream with an error
+            # line to mark the member list as incomplete
+            logging.error("Error streaming chat members of %s: %s", request.chat_id, e)
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+
+    # One JSON object per line, sent as members are fetched. A final
+    # {"error": ...} line means the list is incomplete.
+    return StreamingResponse(stream_members(), media_type="application/x-ndjson")
+
+
+def _copy_upload(upload: BinaryIO, suffix: str) -> str:
+    """
+    Copies an uploaded file into a named temporary file and returns its path.
+    The caller is responsible for removing the file.
+    """
+    upload.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(upload, tmp)
+    return tmp.name
+
 
 @app.post("/set_chat_photo")
 async def set_chat_photo(
@@ -448,14 +703,15 @@ async def set_chat_photo(
             raise HTTPException(status_code=400, detail="No file uploaded")
 
         if file.content_type.startswith("image"):
-            file_content = await file.read()
-            file_like_object = io.BytesIO(file_content)
-
-            # Directly pass the BytesIO object to Pyrogram
-            await pyro_client.set_chat_photo(chat_id, photo=file_like_object)
-
-            # Cleanup
-            file_like_object.close()
+            # Pyrogram needs a file with a real name, which the spooled upload
+            # file lacks, so hand it a named temporary copy instead. The copy
+            # runs in a worker thread to keep disk I/O off the event loop.
+            suffix = os.path.splitext(file.filename or "")[1] or ".jpg"
+            photo_path = await asyncio.to_thread(_copy_upload, file.file, suffix)
+            try:
+                await pyro_client.set_chat_photo(chat_id, photo=photo_path)
+            finally:
+                os.remove(photo_path)
 
         else:
             raise HTTPException(
@@ -541,6 +797,15 @@ async def leave_chat(
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        # uvloop is not available on Windows
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="info",
+    )